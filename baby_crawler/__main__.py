@@ -2,24 +2,38 @@
 CLI utility to either build and save website map or draw it using previously saved data.
 """
 # type: ignore[attr-defined]
+import atexit
 import datetime
-import json
 import logging
+import logging.handlers
+import queue
 import re
 import time
 
 import click
-import networkx as nx
+import orjson
 from baby_crawler import __version__, crawler
 from click import echo
 
 
 @click.group()
 def main():
+    # Log records are written to stderr by a separate thread,
+    # so crawling tasks don't wait for the console
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter(
+            "[%(asctime)s] %(message)s", datefmt="%d-%m-%y %H:%M:%S"
+        )
+    )
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
     logging.basicConfig(
         level=logging.INFO,
-        format="[%(asctime)s] %(message)s",
-        datefmt="%d-%m-%y %H:%M:%S",
+        format="%(message)s",
+        handlers=[logging.handlers.QueueHandler(log_queue)],
     )
     logging.info(f"Baby-Crawler {__version__}")
 
@@ -62,7 +76,7 @@ def main():
     "--max-pause",
     type=float,
     default=10.0,
-    help="Maximum pause between requests made by one of concurrent tasks",
+    help="Average pause between requests made by one of concurrent tasks",
 )
 @click.option(
     "-o",
@@ -106,7 +120,7 @@ def save(
 
     # Count processed links and errors
 
-    links_found = len(cr.added_tasks)
+    links_found = cr.links_found
     links_crawled = len(cr.crawled_links) - 1
 
     echo(
@@ -121,7 +135,7 @@ def save(
 
     if cr.error_count:
         echo("Errors:", color="red")
-        for error, ammount in cr.error_count.items():
+        for error, ammount in cr.error_count.most_common():
             echo(f"{error}: {ammount}", color="red")
 
     # Write files in case of successfull crawling
@@ -130,23 +144,18 @@ def save(
         if not file_prefix:
             file_prefix = re.sub("[^a-zA-Z0-9]", "_", url)
         file_prefix += time.strftime("_%y-%m-%d_%H-%M-%S", time.localtime())
-        with open(f"{file_prefix}.json", "w+", encoding="utf-8") as json_file:
-            json.dump(
-                nx.node_link_data(cr.site_graph), json_file, ensure_ascii=False
-            )
+        with open(f"{file_prefix}.json", "wb") as json_file:
+            json_file.write(orjson.dumps(cr.to_node_link_data()))
             echo(f"Written graph data to {file_prefix}.json", color="green")
 
         with open(f"{file_prefix}.txt", "w+") as txt_file:
 
-            txt_file.write(cr.site_graph.nodes[1]["url"] + "\n")
-
-            def writegraph(graph, start_node, level):
-                level += 1
-                for i in graph.successors(start_node):
-                    txt_file.write("\t" * level + graph.nodes[i]["url"] + "\n")
-                    writegraph(graph, i, level)
-
-            writegraph(cr.site_graph, 1, 0)
+            txt_file.write(
+                "".join(
+                    "\t" * level + link + "\n"
+                    for level, link in cr.iter_link_tree()
+                )
+            )
 
             echo(f"Written found links to {file_prefix}.txt", color="green")
 
@@ -157,11 +166,12 @@ def draw(input_file):
     from urllib.parse import urlsplit
 
     import matplotlib.pyplot as plt
+    import networkx as nx
     from baby_crawler.eon import hierarchy_pos as hp
 
     limits = plt.axis("off")
 
-    graph_dict = json.load(input_file)
+    graph_dict = orjson.loads(input_file.read())
 
     graph = nx.node_link_graph(graph_dict)
 
@@ -178,4 +188,5 @@ def draw(input_file):
     plt.show()
 
 
-main()
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,84 @@
 """
 Module that contains main class for crawling the website.
 """
-from typing import Generator, List, Set, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Counter,
+    DefaultDict,
+    Deque,
+    Dict,
+    FrozenSet,
+    Generator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import asyncio
-import json
 import logging
-import random
-import re
-from collections import defaultdict
-from urllib.parse import urldefrag, urljoin, urlsplit, urlunsplit
+from collections import defaultdict, deque
+from functools import lru_cache
+from urllib.parse import parse_qsl, urljoin, urlsplit
 
 import aiohttp
-import gazpacho
-import jellyfish
-import networkx
 from baby_crawler import crawler_config
-from baby_crawler.crawlerqueue import CrawlerQueue
 from baby_crawler.exceptions import FetchError
+from baby_crawler.pageparser import PageParser
+from baby_crawler.ratelimiter import RateLimiter
+from yarl import URL
+
+if TYPE_CHECKING:
+    import networkx
+
+
+def _get_host(url: str) -> str:
+    """Returns host part of a URL (with port and credentials, if any).
+
+    Parameters
+    ----------
+    url : str
+        Absolute URL.
+
+    Returns
+    -------
+    str
+        URL host, or "" if the URL has no "://".
+
+    """
+    return (
+        url.partition("://")[2]
+        .partition("/")[0]
+        .partition("?")[0]
+        .partition("#")[0]
+    )
+
+
+def _get_origin(url: str) -> str:
+    """Returns scheme and host of a URL, i.e. "https://google.com".
+
+    Parameters
+    ----------
+    url : str
+        Absolute URL.
+
+    Returns
+    -------
+    str
+        URL origin without trailing slash.
+
+    """
+    return f"{url.partition('://')[0]}://{_get_host(url)}"
 
 
 class Crawler:
-    """Class that performs crawling and gathers data into Networkx graph.
+    """Class that performs crawling and gathers data into the site graph.
 
     Instantiate it, then run make_site_map() to crawl the site.
-    After that you will have access to the data in form of Networkx graph.
+    After that you will have access to the data through iter_link_tree()
+    or in form of Networkx graph made by to_networkx().
     """
 
     def __init__(
@@ -57,7 +111,9 @@ class Crawler:
         concurrency : int
             Maximum ammount of concurrent requests.
         max_pause : float
-            Maximum pause between requests made by one of concurrent tasks.
+            Average pause between requests made by one of concurrent tasks.
+            All tasks share one rate limit, so the site gets `concurrency`
+            requests per `max_pause` seconds on average.
 
         Returns
         -------
@@ -65,36 +121,75 @@ class Crawler:
 
         """
         self.start_url = start_url.strip("/")
-        self.root_url = urlsplit(start_url)[1]
-        self.splash_address = urljoin(
-            splash_address,
-            f"render.html?timeout={crawler_config.splash_timeout}&wait={crawler_config.splash_wait}{crawler_config.splash_params}&url=",
+        self.root_url = urlsplit(start_url).netloc
+        self._root_suffix = "." + self.root_url
+        # Absolute links to the root host are recognized by prefix alone
+        self._root_urls = frozenset(
+            f"{scheme}://{self.root_url}" for scheme in ("http", "https")
+        )
+        self._root_prefixes = tuple(
+            root + sep for root in self._root_urls for sep in "/?#"
+        )
+        # Page URL is added as a query parameter, so it gets properly encoded
+        self.splash_address = URL(
+            urljoin(
+                splash_address,
+                f"render.html?timeout={crawler_config.splash_timeout}&wait={crawler_config.splash_wait}{crawler_config.splash_params}",
+            )
         )
 
         self.allow_subdomains = allow_subdomains
-        self._has_root_url = (
+        self.allow_queries = allow_queries
+
+        # Navigation links repeat on every page, so per-instance caches
+        # turn their repeated checks into a dict lookup.
+        # Links are normalized against parent's origin, not the parent itself,
+        # so that the same href found on different pages hits the cache.
+        cache = lru_cache(maxsize=crawler_config.url_cache_size)
+        self._has_root_url = cache(
             self._has_root_url_or_subdomain
             if allow_subdomains
             else self._has_root_url_only
         )
+        self._normalize_cached = cache(self._normalize_from_origin)
 
-        self.allow_queries = allow_queries
+        # Query keys seen for every (host, path) pair
+        self._query_shapes: DefaultDict[
+            Tuple[str, str], Set[FrozenSet[str]]
+        ] = defaultdict(set)
 
         self.depth_by_desc = depth_by_desc
 
         self.concurrency = concurrency
         self.max_pause = max_pause
 
-        self.site_graph = networkx.DiGraph()
-        self.site_graph.add_node(0, url=self.start_url)
+        # Every URL gets unique ID on first sight, which is also its node ID
+        # in the site graph, stored as adjacency lists indexed by that ID.
+        # Node 0 is a virtual parent of the start page, with no URL.
+        self._url_to_id: Dict[str, int] = {}
+        self._node_urls: List[str] = [""]
+        self._node_titles: List[Union[str, None]] = [None]
+        self._children: List[List[int]] = [[]]
+        self._start_id = self._intern(self.start_url)
 
-        self.crawled_links = {self._normalize_link(start_url, "")}
-        self.added_tasks = set()
+        # The URL table doubles as the set of seen links
+        self.crawled_links: Set[int] = {self._start_id}
 
-        self.error_count = defaultdict(int)
+        self.error_count: Counter[str] = Counter()
 
         self.logger = logging.getLogger("asyncio")
 
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._pending_links: Deque[Tuple[int, int, int]] = deque()
+        self._running_tasks = 0
+        self._rate_limiter: Optional[RateLimiter] = None
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    @property
+    def links_found(self) -> int:
+        """Number of unique links found on the site, except the start URL."""
+        return len(self._url_to_id) - 1
+
     ### Blocking functions
 
     def _has_root_url_only(self, url: str) -> bool:
@@ -111,10 +206,7 @@ class Crawler:
             True if the link starts only with root URL, no subdomain allowed.
 
         """
-        url_base = urlsplit(url)[1]
-        if url_base == self.root_url:
-            return True
-        return False
+        return _get_host(url) == self.root_url
 
     def _has_root_url_or_subdomain(self, url: str) -> bool:
         """Check if the given link starts with root URL or its subdomain.
@@ -130,10 +222,8 @@ class Crawler:
             True if the links contains root URL.
 
         """
-        url_base = urlsplit(url)[1]
-        if ".".join(url_base.split(".")[-2:]) == self.root_url:
-            return True
-        return False
+        url_base = _get_host(url)
+        return url_base == self.root_url or url_base.endswith(self._root_suffix)
 
     def _is_valid_link(self, link: str, parent_link: str) -> bool:
         """Validates given URL against several rules to exclude unrelated links and some spider traps.
@@ -151,65 +241,133 @@ class Crawler:
             True if all conditionsa are met.
 
         """
-        if link[0] == "#":
-            return False
+        return self._is_valid_href(link) and self._is_valid_url(
+            self._normalize_link(link, parent_link)
+        )
+
+    def _is_valid_href(self, link: str) -> bool:
+        """Validates link as it is found on a page, before normalizing.
+
+        Parameters
+        ----------
+        link : str
+            URL for checking.
+
+        Returns
+        -------
+        bool
+            True if the link is worth normalizing.
+
+        """
         if link[0] == "/":
-            if link[:2] == "//":
+            if link.startswith("//"):
                 return False
-        else:
-            if not self._has_root_url(link):
+        elif not (
+            link.startswith(self._root_prefixes) or link in self._root_urls
+        ):
+            # Only subdomain links can be valid after the prefix check fails
+            if not self.allow_subdomains or not link.startswith("http"):
                 return False
-            if link[:4] != "http":
+            if not self._has_root_url(link):
                 return False
 
-        extension = re.findall(r"\A.*\.([a-zA-Z]+)\\?\Z", link)
-        if extension and extension[0] in crawler_config.unwanded_file_exts:
-            return False
-
+        extension = link.rpartition(".")[2]
         if (
-            self.allow_queries
-            and jellyfish.jaro_winkler(
-                urlsplit(parent_url).query, urlsplit(url).query
-            )
-            >= 0.85
+            extension.isalpha()
+            and extension.lower() in crawler_config.unwanded_file_exts
         ):
             return False
 
-        if (
-            len(self._normalize_link(link, parent_link))
-            > crawler_config.max_url_length
-        ):
+        return True
+
+    def _is_valid_url(self, url: str) -> bool:
+        """Validates normalized link against URL length limit and spider traps.
+
+        Parameters
+        ----------
+        url : str
+            URL returned by _normalize_link().
+
+        Returns
+        -------
+        bool
+            True if all conditionsa are met.
+
+        """
+        if len(url) > crawler_config.max_url_length:
             return False
 
+        if self.allow_queries:
+            # Links to the same page, that differ only in query values
+            # (i.e. "?page=1" and "?page=2") are treated as a spider trap
+            page, query_shape = self._get_query_shape(url)
+            if query_shape in self._query_shapes.get(page, ()):
+                return False
+
         return True
 
-    def _remove_query(self, url: str) -> str:
-        """Removes query part of a URL (i.e. anythin after "?").
+    def _get_query_shape(
+        self, url: str
+    ) -> Tuple[Tuple[str, str], Optional[FrozenSet[str]]]:
+        """Splits URL into the page it leads to and the set of its query keys.
 
         Parameters
         ----------
         url : str
-            URL with or without query part.
+            Absolute URL.
 
         Returns
         -------
-        str
-            Guaranteed clean URL.
+        Tuple[Tuple[str, str], Optional[FrozenSet[str]]]
+            Tuple of (host, path) pair and a set of query keys,
+            or None instead of the set if the URL has no query.
 
         """
-        split = list(urlsplit(url))
-        split[3] = ""
-        return urlunsplit(split)
+        split = urlsplit(url)
+        query_shape = (
+            frozenset(
+                key for key, _ in parse_qsl(split.query, keep_blank_values=True)
+            )
+            if split.query
+            else None
+        )
+        return (split.netloc, split.path), query_shape
 
-    def _normalize_link(self, link: str, parent_link: str) -> str:
+    def _normalize_link(
+        self, link: str, parent_link: str, origin: Union[str, None] = None
+    ) -> str:
         """Set relative link to absolute. Remove fragment if present. Remove trailing slash.
+        Remove query if queries are not allowed.
 
         Parameters
         ----------
         link : str
-            URL for normalizing that passed _is_valid_link().
+            URL for normalizing that passed _is_valid_href().
         parent_link : str
             URL of the page where given link was found.
+        origin : Union[str, None]
+            Scheme and host of the parent page, i.e. "https://google.com".
+            Taken from parent_link if not specified.
+
+        Returns
+        -------
+        str
+            Clean absolute URL.
+
+        """
+        if link[0] == "/" and "/." in link:  # Dot segments need to be resolved
+            link = urljoin(parent_link, link)
+        return self._normalize_cached(link, origin or _get_origin(parent_link))
+
+    def _normalize_from_origin(self, link: str, origin: str) -> str:
+        """Does the actual normalizing for _normalize_link().
+
+        Parameters
+        ----------
+        link : str
+            Absolute URL or a path without dot segments.
+        origin : str
+            Scheme and host of the page where given link was found.
 
         Returns
         -------
@@ -218,11 +376,13 @@ class Crawler:
 
         """
         if link[0] == "/":
-            normalized_link = urljoin(parent_link, link)
-        else:
-            normalized_link = link
+            link = origin + link
 
-        return urldefrag(normalized_link).url.strip("/")
+        # Fragment, query and trailing slash are cut off in one go
+        link = link.partition("#")[0]
+        if not self.allow_queries:
+            link = link.partition("?")[0]
+        return link.rstrip("?").rstrip("/")
 
     def _filter_links(
         self, links: List[str], parent_link: str
@@ -237,71 +397,159 @@ class Crawler:
         Returns
         -------
         List[str]
-            A list of links, that are valid and not yet been crawled.
+            A list of links, that are valid and not yet been seen.
 
         """
+        origin = _get_origin(parent_link)
         for link in links:
-            if self._is_valid_link(link, parent_link):
-                if not self.allow_queries:
-                    link = self._remove_query(link)
-                link = self._normalize_link(link, parent_link)
-                if not link in self.crawled_links:
+            if self._is_valid_href(link):
+                # Every link is normalized once, so different hrefs
+                # of the same page are compared by their canonical form
+                link = self._normalize_link(link, parent_link, origin)
+                # Every crawled or added link already has an ID
+                if not link in self._url_to_id and self._is_valid_url(link):
+                    if self.allow_queries:
+                        page, query_shape = self._get_query_shape(link)
+                        if query_shape is not None:
+                            self._query_shapes[page].add(query_shape)
                     yield link
 
-    def get_page_data(self, html: str) -> Tuple[str, Set]:
+    def get_page_data(self, html: Union[bytes, str]) -> Tuple[str, Set]:
         """get_page_data.
 
         Parameters
         ----------
-        html : str
-            String of page html.
+        html : Union[bytes, str]
+            Page html. Raw bytes are decoded by the parser itself,
+            according to <meta charset> or detected encoding.
 
         Returns
         -------
         Tuple[str, Set]
-            Tuple containing page title (or "" if none) and a list of validated links.
+            Tuple containing page title (or "" if none) and a set of found links.
 
         """
-        soup = gazpacho.Soup(html)
+        parser = PageParser()
+        parser.feed(html)
+        return parser.close()
 
-        title = soup.find("title", mode="first")
+    def _intern(self, url: str) -> int:
+        """Returns unique ID of the URL, assigning a new one on first sight.
 
-        links = set()
-        for anchor in soup.find(
-            "a", attrs={"href": ""}, partial=True, mode="all"
-        ):
-            if (not "rel" in anchor.attrs) or (
-                anchor.attrs["rel"] != "nofollow"
-            ):
-                links.add(anchor.attrs["href"])
+        Parameters
+        ----------
+        url : str
+            Normalized absolute URL.
 
-        return (title.text if title else "", links)
+        Returns
+        -------
+        int
+            Unique URL ID, which is also a node ID in the site graph.
 
-    def _add_graph_edge(self, node_id: int, parent_id: int, **kwargs) -> None:
+        """
+        url_id = self._url_to_id.get(url)
+        if url_id is None:
+            url_id = len(self._node_urls)
+            self._url_to_id[url] = url_id
+            self._node_urls.append(url)
+            self._node_titles.append(None)
+            self._children.append([])
+        return url_id
+
+    def _add_graph_edge(self, node_id: int, parent_id: int, title: str) -> None:
         """Add and edge to the site graph.
 
         Parameters
         ----------
         node_id : int
-            Unique ID given by CrawlerQueue.
+            Unique page ID.
         parent_id : int
             Parent page ID, i.e. the page in which the node URL was found.
-        kwargs
-            Node attributes i.e. URL, Title etc.
+        title : str
+            Page title.
 
         Returns
         -------
         None
 
         """
-        self.site_graph.add_node(node_id, **kwargs)
-        self.site_graph.add_edge(parent_id, node_id)
+        self._node_titles[node_id] = title
+        self._children[parent_id].append(node_id)
+
+    def iter_link_tree(self) -> Generator[Tuple[int, str], None, None]:
+        """Walks the site graph depth-first, starting from the start page.
+
+        Returns
+        -------
+        Generator[Tuple[int, str], None, None]
+            Tuples of page depth level (0 for the start page) and page URL.
+
+        """
+        stack = [(child, 0) for child in reversed(self._children[0])]
+        while stack:
+            node_id, level = stack.pop()
+            yield level, self._node_urls[node_id]
+            stack.extend(
+                (child, level + 1)
+                for child in reversed(self._children[node_id])
+            )
+
+    def to_networkx(self) -> "networkx.DiGraph":
+        """Builds frozen Networkx graph from the site graph.
+
+        Returns
+        -------
+        networkx.DiGraph
+            Graph with page IDs as nodes and "url" and "title" node attributes.
+
+        """
+        import networkx
+
+        graph = networkx.DiGraph()
+        graph.add_nodes_from(
+            (
+                node_id,
+                {
+                    "url": self._node_urls[node_id],
+                    "title": self._node_titles[node_id],
+                },
+            )
+            for node_id in sorted(self.crawled_links)
+        )
+        graph.add_edges_from(
+            (node_id, child)
+            for node_id in range(1, len(self._children))
+            for child in self._children[node_id]
+        )
+        return networkx.freeze(graph)
+
+    def to_node_link_data(self) -> Dict[str, Any]:
+        """Makes Networkx node-link representation of the site graph.
+
+        The schema is left to the installed Networkx (i.e. it names edges
+        "links" in 2.x and "edges" in 3.6+), so that draw can read it back
+        with networkx.node_link_graph().
+
+        Returns
+        -------
+        Dict[str, Any]
+            Data returned by networkx.node_link_data(self.to_networkx()).
+
+        """
+        import networkx
+
+        data: Dict[str, Any] = networkx.node_link_data(self.to_networkx())
+        return data
 
     ### Async funtions
 
-    async def fetch_page(self, url: str) -> str:
+    async def fetch_page(self, url: str) -> Tuple[str, Set]:
         """Asyncronously fetch a page from given URL using aiohttp and Splash HTTP API.
 
+        The page is parsed chunk by chunk while it is being received,
+        so the raw response body is never buffered. The parsed page tree
+        is kept until the page is complete, though.
+
         Parameters
         ----------
         url : str
@@ -309,8 +557,8 @@ class Crawler:
 
         Returns
         -------
-        str
-            String of fetched page HTML.
+        Tuple[str, Set]
+            Tuple containing page title (or "" if none) and a set of found links.
 
         Raises
         ------
@@ -320,48 +568,64 @@ class Crawler:
             or HTTP error code, while 'message' contains original error message by aiohttp.
 
         """
-        async with aiohttp.ClientSession() as session:
-            self.logger.info(
-                ">>> Requesting Splash: " + self.splash_address + url
-            )
-            try:
-                async with session.get(self.splash_address + url) as response:
-                    response.raise_for_status()
-                    page_data = await response.read()
-                    return page_data.decode()
-            except aiohttp.client_exceptions.ClientConnectorError:
-                self.logger.error("Splash instance is unreachable.")
-                raise FetchError("Splash Unreachable", "Splash unreachable.")
-            except aiohttp.ClientConnectionError as e:
-                raise FetchError(str(e.status), e.message)
-            except asyncio.TimeoutError:
-                raise FetchError("Splash Timeout", "Splash timeout.")
-            except aiohttp.ClientResponseError as e:
-                raise FetchError(str(e.status), e.message)
+        # The session only exists while make_site_map() runs
+        assert self._session is not None
+        splash_url = self.splash_address.update_query(url=url)
+        self.logger.info(">>> Requesting Splash: %s", splash_url)
+        try:
+            async with self._session.get(splash_url) as response:
+                response.raise_for_status()
+                parser = PageParser(encoding=response.charset)
+                async for chunk in response.content.iter_chunked(
+                    crawler_config.chunk_size
+                ):
+                    parser.feed(chunk)
+                return parser.close()
+        except aiohttp.client_exceptions.ClientConnectorError:
+            self.logger.error("Splash instance is unreachable.")
+            raise FetchError("Splash Unreachable", "Splash unreachable.")
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) as e:
+            raise FetchError("Connection Error", str(e))
+        except asyncio.TimeoutError:
+            raise FetchError("Splash Timeout", "Splash timeout.")
+        except aiohttp.ClientResponseError as e:
+            raise FetchError(str(e.status), e.message)
+
+    def _start_link_tasks(self) -> None:
+        """Starts tasks for pending links, while there are free slots.
+
+        Returns
+        -------
+        None
+
+        """
+        while self._pending_links and self._running_tasks < self.concurrency:
+            page_id, parent_id, desc_level = self._pending_links.popleft()
+            page_link = self._node_urls[page_id]
+            coro = self._process_link(page_id, page_link, parent_id, desc_level)
+            self._running_tasks += 1
+            self._tasks.add(asyncio.create_task(coro))
 
     async def _process_link(
         self,
-        queue,
         page_id: int,
         page_link: str,
         parent_id: int,
         desc_level: int,
     ) -> None:
         """Adds a page to site map graph and then processes all the links found on this page.
-        Adds found links to the queue if they are not yet been crawled.
+        Adds found links to pending ones if they are not yet been seen.
 
         Parameters
         ----------
-        queue : asyncio.Queue
-            CrawlerQueue to take items for processing from.
         page_id : int
-            Unique page ID from queue.
+            Unique page ID.
         page_link : str
             Page URL.
         parent_id : int
             Unique ID of a page, where current page URL was found.
         desc_level : int
-            Descendance level of page, from queue.
+            Descendance level of page.
 
         Returns
         -------
@@ -369,74 +633,79 @@ class Crawler:
 
         """
         try:
-
-            page_html = await self.fetch_page(page_link)
-            # If any arror occures during fetch process, the link is not added to the Site Graph
-            self.crawled_links.add(page_link)
-            page_data = self.get_page_data(page_html)
-            self._add_graph_edge(
-                page_id, parent_id, url=page_link, title=page_data[0]
+            # The rate limiter only exists while make_site_map() runs
+            assert self._rate_limiter is not None
+            await self._rate_limiter.wait()
+            self.logger.info(
+                "=> Processing %s. Desc_level: %d.", page_link, desc_level
             )
+            page_data = await self.fetch_page(page_link)
+            # If any arror occures during fetch process, the link is not added to the Site Graph
+            self.crawled_links.add(page_id)
+            self._add_graph_edge(page_id, parent_id, title=page_data[0])
 
             if not self.depth_by_desc or desc_level < self.depth_by_desc:
                 self.logger.info(
-                    f"<<< {len(page_data[1])} links found on {page_link}."
+                    "<<< %d links found on %s.", len(page_data[1]), page_link
                 )
 
+                # Each link is interned before the next one is filtered,
+                # so different hrefs of the same page are added only once
                 for link in self._filter_links(page_data[1], page_link):
-                    if not link in self.added_tasks:
-                        self.added_tasks.add(link)
-                        await queue.put((link, page_id, desc_level + 1))
+                    link_id = self._intern(link)
+                    self._pending_links.append(
+                        (link_id, page_id, desc_level + 1)
+                    )
         except FetchError as e:
             self.error_count[e.error_type] += 1
             # TODO add logging for page url, or adding info to graph
-
-    async def _link_worker(
-        self, worker_number: int, queue: asyncio.Queue
-    ) -> None:
-        """Function from which concurrent workers for processing links are made.
-
-        Parameters
-        ----------
-        worker_number : int
-            Task number for logging.
-        queue : asyncio.Queue
-            CrawlerQueue to take items for processing from.
-
-        Returns
-        -------
-        None
-
-        """
-        while True:
-            page_id, page_link, parent_id, desc_level = await queue.get()
-            await asyncio.sleep(random.uniform(0, self.max_pause))
-            self.logger.info(
-                f"=> Task worker_number {worker_number} is processing {page_link}. Desc_level: {desc_level}."
-            )
-            await self._process_link(
-                queue, page_id, page_link, parent_id, desc_level
-            )
-            queue.task_done()
+        finally:
+            self._running_tasks -= 1
+        self._start_link_tasks()
 
     async def _run_crawler(self) -> None:
         """Asyncronous function to initiate concurrent site crawling.
 
+        Found links are kept in a deque, and tasks for them are started
+        as soon as there are less than `concurrency` tasks running.
+        Running tasks are tracked in a set until it drains.
+        The first unexpected error in a task stops the crawl and is re-raised.
+
         Returns
         -------
         None
 
         """
-        queue = CrawlerQueue()
-        queue.put_nowait((self.start_url, 0, 0))
-        workers = [
-            asyncio.create_task(self._link_worker(i, queue))
-            for i in range(self.concurrency)
-        ]
-        await queue.join()
-        for worker in workers:
-            worker.cancel()
-        await asyncio.gather(*workers, return_exceptions=True)
+        # One session for the whole crawl, so connections to Splash are kept alive
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency * 2,
+            limit_per_host=self.concurrency,
+            ttl_dns_cache=crawler_config.dns_cache_ttl,
+            keepalive_timeout=crawler_config.keepalive_timeout,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=crawler_config.request_timeout),
+        )
+        self._session = session
+        self._pending_links = deque([(self._start_id, 0, 0)])
+        self._running_tasks = 0
+        self._rate_limiter = RateLimiter(self.max_pause / self.concurrency)
+        self._tasks = set()
+        try:
+            self._start_link_tasks()
+            while self._tasks:
+                done, _ = await asyncio.wait(
+                    self._tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                self._tasks -= done
+                for task in done:
+                    task.result()
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            await session.close()
 
     ### Main Runner
     def make_site_map(self) -> None:
@@ -448,6 +717,4 @@ class Crawler:
 
         """
         asyncio.run(self._run_crawler())
-        self.site_graph.remove_node(0)
-        networkx.freeze(self.site_graph)
         self.logger.info("Site map building done!")
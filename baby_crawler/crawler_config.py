@@ -9,73 +9,83 @@ splash_timeout = "10"
 splash_wait = "0.5"
 splash_params = ""
 
+request_timeout = 30
+chunk_size = 65536
+dns_cache_ttl = 300
+# Longer than aiohttp default, so that pauses between requests
+# don't close idle connections to Splash
+keepalive_timeout = 60
+
 max_url_length = 500
+url_cache_size = 4096
 
-unwanded_file_exts = {
-    "txt",
-    "css",
-    "js",
-    "bmp",
-    "gif",
-    "jpg",
-    "jpeg",
-    "ico",
-    "png",
-    "tif",
-    "tiff",
-    "mid",
-    "mp2",
-    "mp3",
-    "mp4",
-    "wav",
-    "avi",
-    "mov",
-    "mpeg",
-    "ram",
-    "m4v",
-    "mkv",
-    "ogg",
-    "ogv",
-    "pdf",
-    "ps",
-    "eps",
-    "tex",
-    "ppt",
-    "pptx",
-    "doc",
-    "docx",
-    "xls",
-    "xlsx",
-    "names",
-    "data",
-    "dat",
-    "exe",
-    "bz2",
-    "tar",
-    "msi",
-    "bin",
-    "7z",
-    "psd",
-    "dmg",
-    "iso",
-    "epub",
-    "dll",
-    "cnf",
-    "tgz",
-    "sha1",
-    "thmx",
-    "mso",
-    "arff",
-    "rtf",
-    "jar",
-    "csv",
-    "rm",
-    "smil",
-    "wmv",
-    "swf",
-    "wma",
-    "zip",
-    "rar",
-    "gz",
-    "pdf",
-}
+unwanded_file_exts = frozenset(
+    {
+        "txt",
+        "css",
+        "js",
+        "bmp",
+        "gif",
+        "jpg",
+        "jpeg",
+        "ico",
+        "png",
+        "tif",
+        "tiff",
+        "mid",
+        "mp2",
+        "mp3",
+        "mp4",
+        "wav",
+        "avi",
+        "mov",
+        "mpeg",
+        "ram",
+        "m4v",
+        "mkv",
+        "ogg",
+        "ogv",
+        "pdf",
+        "ps",
+        "eps",
+        "tex",
+        "ppt",
+        "pptx",
+        "doc",
+        "docx",
+        "xls",
+        "xlsx",
+        "names",
+        "data",
+        "dat",
+        "exe",
+        "bz2",
+        "tar",
+        "msi",
+        "bin",
+        "7z",
+        "psd",
+        "dmg",
+        "iso",
+        "epub",
+        "dll",
+        "cnf",
+        "tgz",
+        "sha1",
+        "thmx",
+        "mso",
+        "arff",
+        "rtf",
+        "jar",
+        "csv",
+        "rm",
+        "smil",
+        "wmv",
+        "swf",
+        "wma",
+        "zip",
+        "rar",
+        "gz",
+        "pdf",
+    }
+)
@@ -0,0 +1,73 @@
+from typing import Set, Tuple, Union
+
+import lxml.etree
+
+# Links are selected by libxml2 itself, without a Python loop over anchors
+_find_links = lxml.etree.XPath(
+    "//a[@href != '' and not(@rel = 'nofollow')]/@href", smart_strings=False
+)
+_find_title = lxml.etree.XPath("(//title)[1]")
+
+
+class PageParser:
+    """
+    Incremental HTML parser, that builds the page tree while the page is being
+    received and extracts its title and links with XPath when it's complete.
+    """
+
+    def __init__(self, encoding: Union[str, None] = None) -> None:
+        """__init__.
+
+        Parameters
+        ----------
+        encoding : Union[str, None]
+            Page encoding, i.e. from Content-Type header.
+            Detected by the parser if not specified or unknown to lxml.
+
+        Returns
+        -------
+        None
+
+        """
+        try:
+            self._parser = lxml.etree.HTMLParser(encoding=encoding)
+        except LookupError:  # I.e. "latin-1" or "x-user-defined"
+            self._parser = lxml.etree.HTMLParser()
+
+    def feed(self, data: Union[bytes, str]) -> None:
+        """Feeds the next chunk of page HTML to the parser.
+
+        Parameters
+        ----------
+        data : Union[bytes, str]
+            Chunk of page HTML.
+
+        Returns
+        -------
+        None
+
+        """
+        self._parser.feed(data)
+
+    def close(self) -> Tuple[str, Set[str]]:
+        """Finishes parsing.
+
+        Returns
+        -------
+        Tuple[str, Set[str]]
+            Tuple containing page title (or "" if none) and a set of found links.
+
+        """
+        try:
+            root = self._parser.close()
+        except lxml.etree.XMLSyntaxError:
+            root = None
+        if root is None:  # Empty document
+            return ("", set())
+
+        # Only the first title counts, the rest are misplaced ones
+        title = _find_title(root)
+        return (
+            "".join(title[0].itertext()).strip() if title else "",
+            set(_find_links(root)),
+        )
@@ -0,0 +1,40 @@
+import asyncio
+import random
+
+
+class RateLimiter:
+    """
+    Rate limiter shared by concurrent tasks, that spaces their requests out
+    with random intervals.
+    """
+
+    def __init__(self, interval: float) -> None:
+        """__init__.
+
+        Parameters
+        ----------
+        interval : float
+            Average interval between requests in seconds.
+            Actual intervals are random, from 0 to doubled average.
+
+        Returns
+        -------
+        None
+
+        """
+        self.interval = interval
+        self._next_slot = 0.0
+
+    async def wait(self) -> None:
+        """Waits until the next request slot is due and books the following one.
+
+        Returns
+        -------
+        None
+
+        """
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + random.uniform(0, 2 * self.interval)
+        if slot > now:
+            await asyncio.sleep(slot - now)
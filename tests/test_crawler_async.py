@@ -0,0 +1,96 @@
+"""Testing crawling of a site served by a fake Splash instance."""
+
+from typing import Any, Dict
+
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from baby_crawler import crawler
+
+SITE = {
+    "http://site.test": ["/a", "/b", "/a#top", "/missing", "/picture.png"],
+    "http://site.test/a": ["/a/c", "/", "/b"],
+    "http://site.test/b": ["/a", "/b/d"],
+    "http://site.test/a/c": ["/a/c/deep"],
+    "http://site.test/b/d": ["/b/d/deep"],
+    "http://site.test/a/c/deep": [],
+    "http://site.test/b/d/deep": [],
+}
+
+
+@pytest.fixture
+def splash():
+    """Fake Splash, that renders SITE pages and records requested URLs."""
+    stats: Dict[str, Any] = {"fetched": [], "in_flight": 0, "max_in_flight": 0}
+
+    async def render(request):
+        url = request.query["url"]
+        stats["fetched"].append(url)
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        try:
+            await asyncio.sleep(0.02)
+            if url not in SITE:
+                raise web.HTTPNotFound()
+            links = "".join(f'<a href="{link}">link</a>' for link in SITE[url])
+            return web.Response(
+                text=f"<html><head><title>{url}</title></head>"
+                f"<body>{links}</body></html>",
+                content_type="text/html",
+            )
+        finally:
+            stats["in_flight"] -= 1
+
+    app = web.Application()
+    app.router.add_get("/render.html", render)
+    return TestServer(app), stats
+
+
+@pytest.mark.asyncio
+async def test_crawler_make_site_map(splash):
+    server, stats = splash
+    await server.start_server()
+    try:
+        cr = crawler.Crawler(
+            "http://site.test",
+            str(server.make_url("/")),
+            depth_by_desc=2,
+            concurrency=2,
+            max_pause=0.0,
+        )
+        # make_site_map() runs its own event loop, the server runs in this one
+        await asyncio.get_running_loop().run_in_executor(None, cr.make_site_map)
+    finally:
+        await server.close()
+
+    assert len(stats["fetched"]) == len(set(stats["fetched"]))
+    assert set(stats["fetched"]) == {
+        "http://site.test",
+        "http://site.test/a",
+        "http://site.test/b",
+        "http://site.test/missing",
+        "http://site.test/a/c",
+        "http://site.test/b/d",
+    }
+    assert stats["max_in_flight"] == 2
+
+    assert cr.links_found == 5
+    assert cr.error_count == {"404": 1}
+
+    tree = list(cr.iter_link_tree())
+    assert tree[0] == (0, "http://site.test")
+    assert sorted(tree) == [
+        (0, "http://site.test"),
+        (1, "http://site.test/a"),
+        (1, "http://site.test/b"),
+        (2, "http://site.test/a/c"),
+        (2, "http://site.test/b/d"),
+    ]
+    # Depth-first order: every page follows the page it was found on
+    parents = {}
+    for level, url in tree:
+        parents[level] = url
+        if level:
+            assert url.rpartition("/")[0] == parents[level - 1]
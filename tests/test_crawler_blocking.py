@@ -1,5 +1,6 @@
 """Testing syncronous functions of the Crawler class."""
 
+import networkx
 import pytest
 from baby_crawler import crawler
 
@@ -27,6 +28,7 @@ def test_crawler_has_root_domain(allow_subd, subd_result):
     assert cr._has_root_url("https://yandex.ru/search") == False
 
     assert cr._has_root_url("https://mail.google.com") == subd_result
+    assert cr._has_root_url("https://evilgoogle.com") == False
 
 
 @pytest.mark.parametrize(
@@ -55,6 +57,11 @@ def test_crawler_is_valid_link(allow_subd, subd_result):
         == subd_result
     )
 
+    assert cr._is_valid_link("/picture.png", "https://google.com") == False
+    assert cr._is_valid_link("/picture.PNG", "https://google.com") == False
+    assert cr._is_valid_link("/archive.tar.gz", "https://google.com") == False
+    assert cr._is_valid_link("/page.html", "https://google.com") == True
+
 
 def test_crawler_get_page_data(checkup_html):
     cr = crawler.Crawler("https://google.com", "")
@@ -63,6 +70,10 @@ def test_crawler_get_page_data(checkup_html):
         cr.get_page_data(checkup_html["html"])
         == checkup_html["title_nonempty_links"]
     )
+    assert (
+        cr.get_page_data(checkup_html["html"].encode())
+        == checkup_html["title_nonempty_links"]
+    )
 
 
 @pytest.mark.parametrize(
@@ -101,12 +112,82 @@ def test_crawler_normalize_link():
         )
         == "https://mail.google.com/help"
     )
+    assert (
+        cr._normalize_link("/search/?q=1#top", "https://google.com/")
+        == "https://google.com/search"
+    )
+    assert (
+        cr._normalize_link("/a/../b/", "https://google.com/")
+        == "https://google.com/b"
+    )
+
+    # The same href from another page of the site is normalized from cache
+    hits = cr._normalize_cached.cache_info().hits
+    assert (
+        cr._normalize_link("/help", "https://google.com/search")
+        == "https://google.com/help"
+    )
+    assert cr._normalize_cached.cache_info().hits == hits + 1
+
 
+def test_crawler_is_valid_link_query_shapes():
+    cr = crawler.Crawler("https://google.com", "", allow_queries=True)
+
+    assert list(
+        cr._filter_links(
+            [
+                "/search?page=1",
+                "/search?page=2",
+                "/search?page=2&sort=asc",
+                "/images?page=2",
+            ],
+            "https://google.com",
+        )
+    ) == [
+        "https://google.com/search?page=1",
+        "https://google.com/search?page=2&sort=asc",
+        "https://google.com/images?page=2",
+    ]
 
-def test_remove_query():
+    # Validation itself doesn't remember anything
+    assert cr._is_valid_link("/search?page=3", "https://google.com") == False
+    assert cr._is_valid_link("/search?page=3", "https://google.com") == False
+    assert cr._is_valid_link("/search?sort=asc", "https://google.com") == True
+    assert cr._is_valid_link("/search?sort=asc", "https://google.com") == True
+
+
+def test_crawler_site_graph():
     cr = crawler.Crawler("https://google.com", "")
 
-    assert (
-        cr._remove_query("https://google.com/search?page=42")
-        == "https://google.com/search"
-    )
+    root_id = cr._intern("https://google.com")
+    a_id = cr._intern("https://google.com/a")
+    b_id = cr._intern("https://google.com/b")
+    cr._intern("https://google.com/unreachable")
+    c_id = cr._intern("https://google.com/a/c")
+    assert (root_id, a_id, b_id, c_id) == (1, 2, 3, 5)
+    assert cr._intern("https://google.com/a") == a_id
+    assert cr.links_found == 4
+
+    cr._add_graph_edge(root_id, 0, "Root")
+    cr._add_graph_edge(b_id, root_id, "B")
+    cr._add_graph_edge(a_id, root_id, "A")
+    cr._add_graph_edge(c_id, a_id, "C")
+    cr.crawled_links.update((a_id, b_id, c_id))
+
+    assert list(cr.iter_link_tree()) == [
+        (0, "https://google.com"),
+        (1, "https://google.com/b"),
+        (1, "https://google.com/a"),
+        (2, "https://google.com/a/c"),
+    ]
+
+    graph = cr.to_networkx()
+    assert sorted(graph.nodes) == [1, 2, 3, 5]
+    assert sorted(graph.edges) == [(1, 2), (1, 3), (2, 5)]
+    assert graph.nodes[2] == {"url": "https://google.com/a", "title": "A"}
+
+    data = cr.to_node_link_data()
+    assert data == networkx.node_link_data(graph)
+    restored = networkx.node_link_graph(data)
+    assert sorted(restored.edges) == sorted(graph.edges)
+    assert restored.nodes[2] == graph.nodes[2]
@@ -0,0 +1,26 @@
+"""Testing incremental page parser."""
+
+from baby_crawler.pageparser import PageParser
+
+
+def test_pageparser_chunks(checkup_html):
+    html = checkup_html["html"].encode()
+    parser = PageParser(encoding="utf-8")
+    for i in range(0, len(html), 16):
+        parser.feed(html[i : i + 16])
+
+    assert parser.close() == checkup_html["title_nonempty_links"]
+
+
+def test_pageparser_empty():
+    parser = PageParser()
+    parser.feed(b"")
+
+    assert parser.close() == ("", set())
+
+
+def test_pageparser_unknown_encoding(checkup_html):
+    parser = PageParser(encoding="x-user-defined")
+    parser.feed(checkup_html["html"].encode())
+
+    assert parser.close() == checkup_html["title_nonempty_links"]
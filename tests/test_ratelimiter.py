@@ -0,0 +1,31 @@
+"""Testing the rate limiter shared by crawling tasks."""
+
+import asyncio
+import random
+
+import pytest
+from baby_crawler import ratelimiter
+
+
+@pytest.mark.asyncio
+async def test_ratelimiter_shared_slots(monkeypatch):
+    # Intervals are always the average one
+    monkeypatch.setattr(random, "uniform", lambda a, b: (a + b) / 2)
+    limiter = ratelimiter.RateLimiter(0.05)
+    loop = asyncio.get_running_loop()
+    slots = []
+
+    async def task():
+        for _ in range(2):
+            await limiter.wait()
+            slots.append(loop.time())
+
+    start = loop.time()
+    await asyncio.gather(task(), task(), task())
+
+    # Three tasks share one schedule, so six requests take five intervals
+    assert len(slots) == 6
+    assert slots[0] - start < 0.05
+    for previous, current in zip(slots, slots[1:]):
+        assert current - previous == pytest.approx(0.05, abs=0.02)
+    assert limiter._next_slot == pytest.approx(start + 6 * 0.05, abs=0.01)